@@ -2,7 +2,13 @@
 ml_pipeline_dag.py
 ==================
 Airflow orchestration for the Breast-Cancer diagnostic pipeline.
-Four linear tasks, one per ETL stage.
+Load → preprocess → train → evaluate run fused in one in-memory task
+(`etl.pipeline.run_pipeline`, no intermediate files between stages);
+artefact export fans out into parallel model / metrics uploads
+(`export` TaskGroup): one-up-to-many-down keeps scheduling cheap.
+`check_input` short-circuits the whole run when the input data has the
+same SHA-256 as at the last successful run (Airflow Variable) and
+the artefacts (model.npz, metrics.json) are still in place.
 
 Run cadence  : manual by default (set schedule_interval='@daily' to run daily)
 Author       : P. Popov
@@ -10,18 +16,38 @@ Created      : 2025-06-17
 """
 
 from datetime import datetime, timedelta
+from pathlib import Path
 
 from airflow import DAG
-from airflow.operators.python import PythonOperator
+from airflow.models import Variable
+from airflow.operators.python import PythonOperator, ShortCircuitOperator
+from airflow.utils.task_group import TaskGroup
 
+from etl._fingerprint import source_fingerprint
+from etl.evaluate_metrics import METRICS_FILENAME
 from etl.export_results import export_results
-# import the callable steps from etl package
-from etl.load_data import load_data
-from etl.preprocess_data import preprocess_data
-from etl.train_model import train_model
-from etl.evaluate_metrics import evaluate_metrics
+# fused load → preprocess → train → evaluate from etl package
+from etl.pipeline import DEFAULT_OUT_DIR, run_pipeline
+from etl.train_model import MODEL_FILENAME
 
 DAG_ID = "ml_pipeline_breast_cancer"
+FINGERPRINT_VAR = f"{DAG_ID}_input_fp"
+ARTEFACT_NAMES = (MODEL_FILENAME, METRICS_FILENAME)  # must exist to skip a run
+
+
+def _input_changed(source_csv=None, out_dir=DEFAULT_OUT_DIR):
+    """False (skip downstream) if input and artefacts are unchanged, else the new fingerprint."""
+    fp = source_fingerprint(source_csv)
+    if (fp == Variable.get(FINGERPRINT_VAR, default_var=None)
+            and all((Path(out_dir) / name).exists() for name in ARTEFACT_NAMES)):
+        return False
+    return fp  # truthy → pushed to XCom for record_fingerprint
+
+
+def _record_fingerprint(ti):
+    """Remember the input fingerprint only once the whole run has succeeded."""
+    Variable.set(FINGERPRINT_VAR, ti.xcom_pull(task_ids="check_input"))
+
 
 default_args = {
     "owner": "data-team",
@@ -36,35 +62,41 @@ with DAG(
     start_date=datetime(2025, 6, 1),
     schedule_interval=None,           # change to '@daily' for daily run
     catchup=False,                    # do not back-fill missed periods
+    max_active_tasks=4,               # let the export fan-out run concurrently
     default_args=default_args,
     tags=["ml", "breast-cancer", "logreg"],
 ) as dag:
 
-    t1 = PythonOperator(
-        task_id="load_data",
-        python_callable=load_data,     # uses defaults → writes results/data_raw.csv
+    t0 = ShortCircuitOperator(
+        task_id="check_input",
+        python_callable=_input_changed,  # same source_csv / out_dir as train_eval
     )
 
-    t2 = PythonOperator(
-        task_id="preprocess_data",
-        python_callable=preprocess_data,
+    t1 = PythonOperator(
+        task_id="train_eval",
+        python_callable=run_pipeline,  # defaults → model.npz, metrics.json
+        # op_kwargs={"persist_intermediate": True},  # keep data_*.parquet for debugging
     )
 
-    t3 = PythonOperator(
-        task_id="train_model",
-        python_callable=train_model,
-    )
+    # export_model / export_metrics depend only on train_eval, not on each other
+    with TaskGroup(group_id="export") as export:
+        t2 = PythonOperator(
+            task_id="export_model",
+            python_callable=export_results,  # локально
+            op_kwargs={"artifact": "model"},
+            # op_kwargs={"artifact": "model", "mode": "s3", "bucket": "ml-artifacts", "prefix": "bc_demo/"},
+        )
 
-    t4 = PythonOperator(
-        task_id="evaluate_metrics",
-        python_callable=evaluate_metrics,
-    )
+        t3 = PythonOperator(
+            task_id="export_metrics",
+            python_callable=export_results,
+            op_kwargs={"artifact": "metrics"},
+        )
 
-    t5 = PythonOperator(
-        task_id="export_results",
-        python_callable=export_results,  # локально
-        # op_kwargs={"mode": "s3", "bucket": "ml-artifacts", "prefix": "bc_demo/"},
+    t4 = PythonOperator(
+        task_id="record_fingerprint",
+        python_callable=_record_fingerprint,
     )
 
-    # linear dependency chain
-    t1 >> t2 >> t3 >> t4 >> t5
+    # check_input → train_eval → [export.export_model, export.export_metrics] → record_fingerprint
+    t0 >> t1 >> export >> t4
@@ -0,0 +1,45 @@
+"""
+etl/_fingerprint.py
+===================
+SHA-256 отпечатки входных данных конвейера.
+
+По отпечатку DAG решает, изменился ли вход с прошлого успешного
+прогона: если нет — шаги load → … → export пропускаются.
+
+Вход — либо локальный `wdbc.data`, либо CSV, который scikit-learn
+поставляет вместе с `load_breast_cancer()`
+(`sklearn/datasets/data/breast_cancer.csv`).
+"""
+from __future__ import annotations
+
+import hashlib
+from importlib import resources
+from pathlib import Path
+from typing import Optional
+
+SKLEARN_DATA_MODULE = "sklearn.datasets.data"
+SKLEARN_CSV_NAME = "breast_cancer.csv"
+HASH_BUFSIZE = 1 << 20
+
+
+def fingerprint(path: Path | str) -> str:
+    """SHA-256 содержимого файла (hex)."""
+    with open(path, "rb") as fh:
+        if hasattr(hashlib, "file_digest"):  # Python ≥ 3.11: буфер без копий в Python
+            return hashlib.file_digest(fh, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for block in iter(lambda: fh.read(HASH_BUFSIZE), b""):
+            digest.update(block)
+        return digest.hexdigest()
+
+
+def source_fingerprint(source_csv: Optional[str | Path] = None) -> str:
+    """
+    Отпечаток источника данных, который прочитает `build_raw_dataset`.
+
+    `source_csv` — путь к wdbc.data; если None, берётся CSV из sklearn.
+    """
+    if source_csv:
+        return fingerprint(source_csv)
+    with resources.as_file(resources.files(SKLEARN_DATA_MODULE) / SKLEARN_CSV_NAME) as path:
+        return fingerprint(path)
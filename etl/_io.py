@@ -0,0 +1,144 @@
+"""
+etl/_io.py
+==========
+Общие функции чтения/записи артефактов ETL-конвейера.
+
+В памяти набор — `etl.dataset.Dataset` (ndarray-ы X / y + имена
+признаков), на диске:
+  • сырой набор `data_raw.npz` — готовые ndarray без текстового
+    представления: `X` (float32), `y` (int8), `feature_names`;
+  • `data_clean`, `test_data` — Parquet (Snappy) через `pyarrow.Table`:
+    30 колонок float32 + `diagnosis` (dictionary B/M). DataFrame при
+    этом не создаётся;
+  • модель `model.npz` — только состояние LogisticRegression:
+    `coef` (1 × 30, float32), `intercept` (float32), `classes` (B/M);
+    без pickle и разрешения классов sklearn при загрузке.
+
+Единственный текстовый вход — UCI-файл `wdbc.data`; он читается парсером
+pyarrow с явной схемой:
+  • 30 числовых признаков → float32;
+  • `diagnosis`           → category (B/M);
+  • `id`                  → int64.
+
+При USE_IO_URING=1 (Linux, установлен `liburing`) входные файлы читаются
+в память через io_uring (`etl.io_uring_reader`), и pyarrow разбирает уже
+готовый буфер.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from etl import io_uring_reader
+from etl.dataset import LABELS, Dataset, make_dataset
+
+FEATURE_TYPE = pa.float32()
+DIAGNOSIS_TYPE = pa.dictionary(pa.int32(), pa.string())  # B/M как словарь
+ID_TYPE = pa.int64()
+
+PARQUET_COMPRESSION = "snappy"
+
+
+def column_types(columns: Iterable[str]) -> dict[str, pa.DataType]:
+    """Схема для набора колонок: всё, кроме `diagnosis`/`id`, — признаки float32."""
+    special = {"diagnosis": DIAGNOSIS_TYPE, "id": ID_TYPE}
+    return {c: special.get(c, FEATURE_TYPE) for c in columns}
+
+
+def open_input(path: Path | str):
+    """Источник для парсеров pyarrow: буфер io_uring, если он включён, иначе путь."""
+    if io_uring_reader.enabled():
+        # py_buffer оборачивает bytearray без копии
+        return pa.BufferReader(pa.py_buffer(io_uring_reader.read_file(path)))
+    return path
+
+
+def features_from_table(table: pa.Table, feature_names: Iterable[str]) -> np.ndarray:
+    """Собирает C-contiguous матрицу float32 из колонок-признаков таблицы."""
+    feature_names = list(feature_names)
+    X = np.empty((table.num_rows, len(feature_names)), dtype=np.float32)
+    for j, name in enumerate(feature_names):
+        X[:, j] = table.column(name).to_numpy()
+    return X
+
+
+def labels_from_table(table: pa.Table) -> np.ndarray:
+    """
+    Колонка `diagnosis` (B/M) → метки int8 (M → 1).
+
+    Любое другое значение (пусто/null, 'X', 'm', …) — ошибка: молча
+    считать его 'B' значит обучаться на испорченных метках.
+    """
+    diagnosis = table.column("diagnosis").to_numpy(zero_copy_only=False)
+    is_m = diagnosis == "M"
+    n_invalid = int((~(is_m | (diagnosis == "B"))).sum())
+    if n_invalid:
+        raise ValueError(f"Обнаружено {n_invalid} значений 'diagnosis' вне {LABELS} "
+                         "(включая пустые).")
+    return is_m.astype(np.int8)
+
+
+def to_table(ds: Dataset) -> pa.Table:
+    """
+    Dataset → Arrow-таблица: признаки float32 + `diagnosis` (dictionary B/M).
+
+    Метки int8 (0/1) сразу служат индексами словаря `LABELS` — буфер `y`
+    оборачивается без копии и без построения строковой колонки.
+    """
+    columns = [pa.array(ds.X[:, j]) for j in range(ds.X.shape[1])]
+    columns.append(pa.DictionaryArray.from_arrays(pa.array(ds.y), pa.array(LABELS)))
+    return pa.Table.from_arrays(columns, names=ds.feature_names + ["diagnosis"])
+
+
+def read_dataset(path: Path | str) -> Dataset:
+    """Читает промежуточный набор из Parquet."""
+    table = pq.read_table(open_input(path))
+    if "diagnosis" not in table.column_names:
+        raise ValueError(f"В наборе {path} отсутствует колонка 'diagnosis'.")
+    feature_names = [c for c in table.column_names if c != "diagnosis"]
+    return Dataset(features_from_table(table, feature_names), labels_from_table(table),
+                   feature_names)
+
+
+def write_dataset(ds: Dataset, path: Path | str) -> None:
+    """Сохраняет промежуточный набор в Parquet (Snappy)."""
+    pq.write_table(to_table(ds), path, compression=PARQUET_COMPRESSION)
+
+
+def write_raw_bundle(path: Path | str, ds: Dataset) -> None:
+    """Сохраняет сырой набор в несжатый npz: X float32, y int8, имена признаков."""
+    np.savez(path, X=ds.X, y=ds.y, feature_names=np.asarray(ds.feature_names))
+
+
+def read_raw_bundle(path: Path | str) -> Dataset:
+    """Читает `data_raw.npz`; dtype-ы массивов сохраняются как есть."""
+    with np.load(path) as bundle:
+        return make_dataset(bundle["X"], bundle["y"], bundle["feature_names"].tolist())
+
+
+def write_model(model, path: Path | str) -> None:
+    """Сохраняет коэффициенты бинарной LogisticRegression в несжатый npz."""
+    np.savez(path, coef=model.coef_.astype(np.float32),
+             intercept=model.intercept_.astype(np.float32),
+             classes=np.asarray(LABELS))
+
+
+def read_model(path: Path | str):
+    """Восстанавливает `LogisticRegression` из `model.npz` (для оценки и инференса)."""
+    from sklearn.linear_model import LogisticRegression
+
+    with np.load(path) as params:
+        coef, intercept, classes = params["coef"], params["intercept"], params["classes"]
+    # Коды меток модели — индексы в LABELS; другой порядок перевернул бы прогнозы
+    if classes.tolist() != LABELS:
+        raise ValueError(f"Классы модели {path}: {classes.tolist()}, ожидались {LABELS}.")
+    model = LogisticRegression()
+    model.coef_ = coef
+    model.intercept_ = intercept
+    model.classes_ = np.arange(len(LABELS))  # коды меток: индекс в LABELS
+    model.n_features_in_ = coef.shape[1]
+    return model
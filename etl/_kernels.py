@@ -0,0 +1,52 @@
+"""
+etl/_kernels.py
+===============
+Numba-ядро инференса: прогноз LogisticRegression и матрица ошибок 2×2
+за один проход по тестовой выборке.
+
+Для каждой строки считается `x · w + b`, порог `> 0` даёт прогноз,
+и сразу же увеличивается один из счётчиков tn / fp / fn / tp — без
+промежуточных массивов scores / y_pred. Строки обрабатываются
+параллельно (`prange`), счётчики — скалярные редукции Numba.
+
+Numba — необязательная зависимость: без неё `HAVE_NUMBA = False`,
+и `etl.evaluate_metrics` считает то же самое через NumPy (`@` + bincount).
+"""
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba не установлена → NumPy-путь в evaluate_metrics
+    HAVE_NUMBA = False
+    prange = range
+else:
+    HAVE_NUMBA = True
+
+
+def _score_and_confuse(X, y, w, b):
+    """Матрица ошибок [tn, fp, fn, tp] для прогнозов `X · w + b > 0`."""
+    tn = fp = fn = tp = 0
+    for i in prange(X.shape[0]):
+        s = b
+        for j in range(X.shape[1]):
+            s += X[i, j] * w[j]
+        if s > 0:
+            if y[i]:
+                tp += 1
+            else:
+                fp += 1
+        else:
+            if y[i]:
+                fn += 1
+            else:
+                tn += 1
+    return np.array([tn, fp, fn, tp], dtype=np.int64)
+
+
+if HAVE_NUMBA:
+    # Компилируется при первом вызове, машинный код кэшируется на диск
+    score_and_confuse = njit(parallel=True, fastmath=True, cache=True)(_score_and_confuse)
+else:
+    score_and_confuse = None
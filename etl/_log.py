@@ -0,0 +1,32 @@
+"""
+etl/_log.py
+===========
+Единая настройка логирования пакета `etl`.
+
+Обработчик (StreamHandler + формат) и уровень (LOG_LEVEL) вешаются один
+раз на общий логгер `etl`; логгеры модулей (`etl.load_data`, …) лишь
+пропагируют в него записи. Повторный импорт модулей воркером Airflow
+не плодит дублирующих обработчиков.
+"""
+from __future__ import annotations
+
+import logging
+import os
+
+PACKAGE_LOGGER = "etl"
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Логгер модуля внутри `etl`; при первом вызове настраивает общий логгер пакета."""
+    package_logger = logging.getLogger(PACKAGE_LOGGER)
+    if not package_logger.handlers:
+        package_logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        package_logger.addHandler(handler)
+
+    # Запуск шага из CLI (`python -m etl.<step>`) даёт name == "__main__"
+    if name != PACKAGE_LOGGER and not name.startswith(PACKAGE_LOGGER + "."):
+        name = f"{PACKAGE_LOGGER}.{name}"
+    return logging.getLogger(name)
@@ -0,0 +1,31 @@
+"""
+etl/dataset.py
+==============
+Представление набора данных, которым обмениваются шаги ETL-конвейера.
+
+Вместо DataFrame шаги передают друг другу `Dataset`:
+  • `X`             — C-contiguous матрица признаков float32 (n × 30);
+  • `y`             — метки int8 (M → 1, B → 0);
+  • `feature_names` — имена 30 признаков.
+"""
+from __future__ import annotations
+
+from typing import List, NamedTuple
+
+import numpy as np
+
+# Порядок меток: индекс в списке == код в `y`
+LABELS = ["B", "M"]
+
+
+class Dataset(NamedTuple):
+    X: np.ndarray
+    y: np.ndarray
+    feature_names: List[str]
+
+
+def make_dataset(X, y, feature_names) -> Dataset:
+    """Собирает `Dataset`, приводя X к contiguous float32, а y — к int8."""
+    return Dataset(X=np.ascontiguousarray(X, dtype=np.float32),
+                   y=np.asarray(y, dtype=np.int8),
+                   feature_names=list(feature_names))
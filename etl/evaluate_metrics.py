@@ -5,23 +5,30 @@ etl/evaluate_metrics.py
 на отложенной тестовой выборке.
 
 1. Загружает:
-   • обученную модель (`results/model.pkl`);
-   • CSV с тестовой выборкой (`results/test_data.csv`) — содержит
+   • коэффициенты обученной модели (`results/model.npz`);
+   • Parquet с тестовой выборкой (`results/test_data.parquet`) — содержит
      все 30 признаков + колонку `diagnosis` (B/M).
 
-2. Делит DataFrame на X (признаки) и y (метки), получает прогнозы.
+2. Берёт из набора X (признаки) и y (метки), получает прогнозы
+   решающей функцией модели `X · coef_ + intercept_ > 0`.
 
 3. Вычисляет Accuracy, Precision, Recall, F1-score (класс M — «злокач.»
-   принимается положительным).
+   принимается положительным) из одной матрицы ошибок 2×2.
+   Для крупных выборок (≥ NUMBA_MIN_ROWS строк) и установленной Numba
+   прогноз и подсчёт матрицы идут одним параллельным ядром
+   `etl._kernels.score_and_confuse`; иначе — NumPy (`@` + `np.bincount`).
+   На небольшой тестовой выборке импорт Numba и загрузка ядра стоят
+   дороже самого расчёта, поэтому `etl._kernels` импортируется лениво.
+   classification_report пишется лишь при LOG_LEVEL=DEBUG.
 
 4. Сохраняет метрики в JSON-файл `results/metrics.json`
    и выводит значения в лог.
 
 Запуск
 ------
-$ python etl/evaluate_metrics.py
-$ python etl/evaluate_metrics.py --model results/model.pkl \
-                                 --test_csv results/test_data.csv \
+$ python -m etl.evaluate_metrics
+$ python -m etl.evaluate_metrics --model results/model.npz \
+                                 --test_parquet results/test_data.parquet \
                                  --out_dir results
 """
 from __future__ import annotations
@@ -33,39 +40,107 @@ import os
 from pathlib import Path
 from typing import Dict
 
-import joblib
-import pandas as pd
-from sklearn.metrics import (
-    accuracy_score,
-    precision_score,
-    recall_score,
-    f1_score,
-    classification_report,
-)
+import numpy as np
+from sklearn import config_context
+from sklearn.metrics import classification_report
+
+from etl._io import read_dataset, read_model
+from etl._log import get_logger
 
 # --------------------------------------------------------------------------- #
 # Логирование
 # --------------------------------------------------------------------------- #
-logger = logging.getLogger(__name__)
-logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
-_handler = logging.StreamHandler()
-_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
-logger.addHandler(_handler)
+logger = get_logger(__name__)
 
 # --------------------------------------------------------------------------- #
 # Константы
 # --------------------------------------------------------------------------- #
-DEFAULT_MODEL = Path(os.getenv("MODEL_PKL", "../results/model.pkl"))
-DEFAULT_TEST_CSV = Path(os.getenv("TEST_CSV", "../results/test_data.csv"))
+DEFAULT_MODEL = Path(os.getenv("MODEL_NPZ", "../results/model.npz"))
+DEFAULT_TEST_PARQUET = Path(os.getenv("TEST_PARQUET", "../results/test_data.parquet"))
 DEFAULT_OUT_DIR = Path(os.getenv("OUT_DIR", "results"))
 METRICS_FILENAME = "metrics.json"
+# С какого размера выборки окупается Numba-ядро (импорт numba + загрузка ядра ≈ 0.5 с)
+NUMBA_MIN_ROWS = int(os.getenv("NUMBA_MIN_ROWS", "100000"))
+
+
+# --------------------------------------------------------------------------- #
+# Вспомогательные функции
+# --------------------------------------------------------------------------- #
+def _predict(X: np.ndarray, w: np.ndarray, b: float) -> np.ndarray:
+    """Прогноз LogisticRegression решающей функцией: w·x + b > 0 → класс 1."""
+    return (X @ w + b > 0).view(np.int8)
+
+
+def _confusion_counts(y_true, y_pred) -> np.ndarray:
+    """Матрица ошибок одним bincount-ом: [tn, fp, fn, tp]."""
+    codes = 2 * np.asarray(y_true, dtype=np.intp) + np.asarray(y_pred, dtype=np.intp)
+    return np.bincount(codes, minlength=4)
+
+
+def _metrics_from_confusion(counts: np.ndarray) -> Dict[str, float]:
+    """Accuracy, Precision, Recall, F1 из [tn, fp, fn, tp] (zero_division=0)."""
+    tn, fp, fn, tp = (int(c) for c in counts)
+    return {
+        "accuracy": (tp + tn) / max(tn + fp + fn + tp, 1),
+        "precision": tp / (tp + fp) if tp + fp else 0.0,
+        "recall": tp / (tp + fn) if tp + fn else 0.0,
+        "f1": 2 * tp / (2 * tp + fp + fn) if tp + fp + fn else 0.0,
+    }
 
 
 # --------------------------------------------------------------------------- #
-# Основная функция
+# Основные функции
 # --------------------------------------------------------------------------- #
+def compute_metrics(model, X_test, y_test) -> Dict[str, float]:
+    """
+    Получает прогнозы модели и считает Accuracy, Precision, Recall, F1.
+
+    `y_test` — бинарные метки 0/1 (1 == 'M').
+    """
+    # Решающая функция LogisticRegression напрямую, без валидации входа
+    # внутри model.predict
+    X = np.ascontiguousarray(X_test, dtype=np.float32)
+    y = np.asarray(y_test, dtype=np.int8)
+    w = model.coef_.ravel().astype(np.float32)
+    b = float(model.intercept_[0])
+
+    # Матрица ошибок (класс '1' == 'M' — положительный): на крупной выборке —
+    # Numba-ядром за один проход, иначе NumPy-ем через вектор прогнозов
+    counts = None
+    if len(X) >= NUMBA_MIN_ROWS:
+        from etl._kernels import HAVE_NUMBA, score_and_confuse
+
+        if HAVE_NUMBA:
+            counts = score_and_confuse(X, y, w, np.float32(b))
+    if counts is None:
+        counts = _confusion_counts(y, _predict(X, w, b))
+    metrics = _metrics_from_confusion(counts)
+
+    # Доп. отчёт в лог — только в режиме отладки; данные уже проверены
+    # на шаге preprocess_data, повторная проверка на NaN/inf не нужна
+    if logger.isEnabledFor(logging.DEBUG):
+        with config_context(assume_finite=True):
+            logger.debug("=== Classification Report ===\n%s",
+                         classification_report(y, _predict(X, w, b),
+                                               target_names=["Benign", "Malignant"]))
+    logger.info("=== Сводные метрики ===")
+    for k, v in metrics.items():
+        logger.info("  %-10s: %.4f", k, v)
+    return metrics
+
+
+def save_metrics(metrics: Dict[str, float], out_dir: Path | str) -> Path:
+    """Сохраняет метрики в `out_dir/metrics.json`."""
+    metrics_path = Path(out_dir) / METRICS_FILENAME
+    with open(metrics_path, "w", encoding="utf-8") as fp:
+        json.dump(metrics, fp, indent=2)
+
+    logger.info("Метрики сохранены: %s", metrics_path.resolve())
+    return metrics_path
+
+
 def evaluate_metrics(model_path: Path | str = DEFAULT_MODEL,
-                     test_csv: Path | str = DEFAULT_TEST_CSV,
+                     test_parquet: Path | str = DEFAULT_TEST_PARQUET,
                      out_dir: Path | str = DEFAULT_OUT_DIR) -> str:
     """
     Вычисляет Accuracy, Precision, Recall, F1 и сохраняет их в JSON.
@@ -73,9 +148,9 @@ def evaluate_metrics(model_path: Path | str = DEFAULT_MODEL,
     Параметры
     ---------
     model_path : str | Path
-        Файл с сериализованной моделью (pickle/joblib).
-    test_csv : str | Path
-        CSV с тестовой выборкой (30 признаков + 'diagnosis').
+        npz с коэффициентами модели (`coef`, `intercept`, `classes`).
+    test_parquet : str | Path
+        Parquet с тестовой выборкой (30 признаков + 'diagnosis').
     out_dir : str | Path
         Папка, куда сохранить metrics.json.
 
@@ -84,52 +159,23 @@ def evaluate_metrics(model_path: Path | str = DEFAULT_MODEL,
     str – абсолютный путь к сохранённому JSON-файлу с метриками.
     """
     model_path = Path(model_path)
-    test_csv = Path(test_csv)
+    test_parquet = Path(test_parquet)
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
     if not model_path.exists():
         raise FileNotFoundError(f"Model file not found: {model_path}")
-    if not test_csv.exists():
-        raise FileNotFoundError(f"Test CSV not found: {test_csv}")
+    if not test_parquet.exists():
+        raise FileNotFoundError(f"Test dataset not found: {test_parquet}")
 
     logger.info("Загружаю модель: %s", model_path)
-    model = joblib.load(model_path)
-
-    logger.info("Читаю тестовые данные: %s", test_csv)
-    df_test = pd.read_csv(test_csv)
-
-    if "diagnosis" not in df_test.columns:
-        raise ValueError("В тестовом CSV отсутствует колонка 'diagnosis'.")
-
-    X_test = df_test.drop(columns="diagnosis")
-    y_test = df_test["diagnosis"].map({"B": 0, "M": 1})  # бинарные метки 0/1
-
-    # Предсказания
-    y_pred = model.predict(X_test)
+    model = read_model(model_path)
 
-    # Метрики (класс '1' == 'M' — положительный)
-    metrics: Dict[str, float] = {
-        "accuracy": accuracy_score(y_test, y_pred),
-        "precision": precision_score(y_test, y_pred, zero_division=0),
-        "recall": recall_score(y_test, y_pred, zero_division=0),
-        "f1": f1_score(y_test, y_pred, zero_division=0),
-    }
-
-    # Доп. отчёт в лог
-    logger.info("=== Classification Report ===\n%s",
-                classification_report(y_test, y_pred, target_names=["Benign", "Malignant"]))
-    logger.info("=== Сводные метрики ===")
-    for k, v in metrics.items():
-        logger.info("  %-10s: %.4f", k, v)
+    logger.info("Читаю тестовые данные: %s", test_parquet)
+    test = read_dataset(test_parquet)  # X float32, y — бинарные метки 0/1
 
-    # Сохраняем JSON
-    metrics_path = out_dir / METRICS_FILENAME
-    with open(metrics_path, "w", encoding="utf-8") as fp:
-        json.dump(metrics, fp, indent=2)
-
-    logger.info("Метрики сохранены: %s", metrics_path.resolve())
-    return str(metrics_path.resolve())
+    metrics = compute_metrics(model, test.X, test.y)
+    return str(save_metrics(metrics, out_dir).resolve())
 
 
 # --------------------------------------------------------------------------- #
@@ -138,9 +184,9 @@ def evaluate_metrics(model_path: Path | str = DEFAULT_MODEL,
 def _parse_cli_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Оценка метрик модели Breast Cancer")
     parser.add_argument("--model", default=DEFAULT_MODEL,
-                        help="Path to model.pkl (default: results/model.pkl)")
-    parser.add_argument("--test_csv", default=DEFAULT_TEST_CSV,
-                        help="Path to test_data.csv (default: results/test_data.csv)")
+                        help="Path to model.npz (default: results/model.npz)")
+    parser.add_argument("--test_parquet", default=DEFAULT_TEST_PARQUET,
+                        help="Path to test_data.parquet (default: results/test_data.parquet)")
     parser.add_argument("--out_dir", default=DEFAULT_OUT_DIR,
                         help="Directory to save metrics.json (default: results)")
     return parser.parse_args()
@@ -148,4 +194,4 @@ def _parse_cli_args() -> argparse.Namespace:
 
 if __name__ == "__main__":
     args = _parse_cli_args()
-    evaluate_metrics(model_path=args.model, test_csv=args.test_csv, out_dir=args.out_dir)
+    evaluate_metrics(model_path=args.model, test_parquet=args.test_parquet, out_dir=args.out_dir)
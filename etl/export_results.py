@@ -5,62 +5,140 @@ etl/export_results.py
 
 Режимы работы
 -------------
-* local  – просто гарантирует, что обе цели лежат в results/ (дефолт).
+* local  – просто гарантирует, что обе цели лежат в results/ (дефолт);
+           заодно выгружает CSV-копии промежуточных наборов
+           (data_raw.npz, *.parquet) для просмотра глазами — это
+           единственное место конвейера, где строится CSV
+           (пишется C++-writer-ом pyarrow, без pandas).
 * s3     – загружает в указанный S3-бакет.  Авторизация идёт через
            переменные окружения AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY
            (или профили в ~/.aws/credentials).
 
-Пример CLI
-----------
-$ python etl/export_results.py                      # локально
-$ python etl/export_results.py --mode s3           \
+Пример CLI (из корня репозитория)
+---------------------------------
+$ python -m etl.export_results                      # локально
+$ python -m etl.export_results --mode s3           \
       --bucket ml-artifacts --prefix bc_demo/
+$ python -m etl.export_results --artifact metrics  # только metrics.json
+
+`artifact` ("model" | "metrics" | "all") позволяет DAG-у выгружать модель
+и метрики параллельными задачами. CSV-копии наборов пишутся только при
+artifact="all" в режиме local (по умолчанию в CLI) и только для наборов,
+которые есть в results/ (поэтапный запуск или persist_intermediate=True);
+задачи DAG-а их не создают.
 """
 from __future__ import annotations
 
 import argparse
-import logging
+import mimetypes
 import os
 from pathlib import Path
 import shutil
 
+from etl._log import get_logger
+
 RESULTS_DIR = Path(os.getenv("RESULTS_DIR", "results"))
-MODEL = RESULTS_DIR / "model.pkl"
+MODEL = RESULTS_DIR / "model.npz"
 METRICS = RESULTS_DIR / "metrics.json"
+ARTIFACTS = {"model": (MODEL,), "metrics": (METRICS,)}
+COPY_BUFSIZE = 1 << 20  # fallback-копирование блоками по 1 МиБ
+RAW_DATASET = RESULTS_DIR / "data_raw.npz"
+DATASETS = tuple(RESULTS_DIR / f"{name}.parquet" for name in ("data_clean", "test_data"))
 
-logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=os.getenv("LOG_LEVEL", "INFO"),
-    format="%(asctime)s [%(levelname)s] %(message)s",
-)
+logger = get_logger(__name__)
 
 # --------------------------------------------------------------------- #
-def _export_local(out_dir: Path):
+def _copy_file(src: Path, dst: Path):
+    # Байты копируются внутри ядра (copy_file_range) — без цикла read/write
+    # через user-space; для метаданных хватает одного utime вместо copy2
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        st = os.fstat(s.fileno())
+        try:
+            remaining = st.st_size
+            while remaining > 0:
+                copied = os.copy_file_range(s.fileno(), d.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except (AttributeError, OSError):  # не Linux / ФС без поддержки
+            s.seek(0)
+            d.seek(0)
+            d.truncate()
+            shutil.copyfileobj(s, d, length=COPY_BUFSIZE)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def _export_local(out_dir: Path, files: tuple[Path, ...]):
     out_dir.mkdir(parents=True, exist_ok=True)
-    for f in (MODEL, METRICS):
-        shutil.copy2(f, out_dir / f.name)
+    for f in files:
+        _copy_file(f, out_dir / f.name)
         logger.info("Copied %s → %s", f, out_dir / f.name)
 
 
-def _export_s3(bucket: str, prefix: str = ""):
+def _export_csv(out_dir: Path):
+    from pyarrow import csv as pacsv
+
+    from etl._io import read_dataset, read_raw_bundle, to_table
+
+    datasets = {}
+    if RAW_DATASET.exists():
+        datasets[RAW_DATASET] = read_raw_bundle(RAW_DATASET)
+    for f in DATASETS:
+        if f.exists():
+            datasets[f] = read_dataset(f)
+
+    for f, ds in datasets.items():
+        csv_path = out_dir / f"{f.stem}.csv"
+        table = to_table(ds)
+        # Заголовок пишем сами: pyarrow < 17 всегда берёт имена колонок в кавычки
+        with open(csv_path, "wb") as fh:
+            fh.write((",".join(table.column_names) + "\n").encode())
+            pacsv.write_csv(table, fh, write_options=pacsv.WriteOptions(
+                include_header=False, quoting_style="none"))
+        logger.info("Exported %s → %s", f, csv_path)
+
+
+def _export_s3(bucket: str, prefix: str, files: tuple[Path, ...]):
     import boto3
+    from boto3.s3.transfer import TransferConfig, create_transfer_manager
+
     s3 = boto3.client("s3")  # cred-ы читаются автоматом из env/ ~/.aws
-    for f in (MODEL, METRICS):
-        key = f"{prefix}{f.name}"
-        s3.upload_file(str(f), bucket, key)
-        logger.info("Uploaded %s to s3://%s/%s", f, bucket, key)
+    # Один TransferManager на все файлы: общий пул HTTP-соединений,
+    # загрузки идут параллельно, а не по очереди
+    config = TransferConfig(multipart_threshold=8 << 20, max_concurrency=8, use_threads=True)
+    with create_transfer_manager(s3, config) as manager:
+        uploads = []
+        for f in files:
+            key = f"{prefix}{f.name}"
+            content_type = mimetypes.guess_type(f.name)[0] or "application/octet-stream"
+            future = manager.upload(str(f), bucket, key,
+                                    extra_args={"ContentType": content_type})
+            uploads.append((f, key, future))
+        for f, key, future in uploads:
+            future.result()
+            logger.info("Uploaded %s to s3://%s/%s", f, bucket, key)
 
 
 def export_results(mode: str = "local",
                    bucket: str | None = None,
                    prefix: str = "",
-                   out_dir: str | Path = RESULTS_DIR / "export"):
+                   out_dir: str | Path = RESULTS_DIR / "export",
+                   artifact: str = "all"):
+    if artifact == "all":
+        files = tuple(f for group in ARTIFACTS.values() for f in group)
+    elif artifact in ARTIFACTS:
+        files = ARTIFACTS[artifact]
+    else:
+        raise ValueError("artifact must be 'model', 'metrics' or 'all'")
+
     if mode == "local":
-        _export_local(Path(out_dir))
+        _export_local(Path(out_dir), files)
+        if artifact == "all":
+            _export_csv(Path(out_dir))
     elif mode == "s3":
         if not bucket:
             raise ValueError("--bucket обязателен для mode=s3")
-        _export_s3(bucket, prefix)
+        _export_s3(bucket, prefix, files)
     else:
         raise ValueError("mode must be 'local' or 's3'")
 
@@ -73,5 +151,7 @@ if __name__ == "__main__":
     p.add_argument("--prefix", default="", help="S3 key prefix")
     p.add_argument("--out_dir", default=RESULTS_DIR / "export",
                    help="Локальный каталог для copy, если mode=local")
+    p.add_argument("--artifact", choices=["model", "metrics", "all"], default="all",
+                   help="Что выгружать (по умолчанию всё)")
     args = p.parse_args()
-    export_results(args.mode, args.bucket, args.prefix, args.out_dir)
+    export_results(args.mode, args.bucket, args.prefix, args.out_dir, args.artifact)
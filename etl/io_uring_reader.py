@@ -0,0 +1,80 @@
+"""
+etl/io_uring_reader.py
+======================
+Опциональное чтение входных файлов конвейера через io_uring
+(Linux ≥ 5.11, пакет `liburing`).
+
+Под файл выделяется один `bytearray` размера файла; он регистрируется
+в кольце как единственный фиксированный буфер (`io_uring_register_buffers`),
+и файл читается одной `IORING_OP_READ_FIXED` — ядро пишет прямо в этот
+буфер. Результат отдаётся вызывающему как есть (в `etl._io` — через
+`pa.py_buffer`), без склейки и повторного копирования.
+
+Кольцо и регистрация живут в пределах одного вызова `read_file`:
+буфер у каждого файла свой. Файлы крупнее `MAX_FIXED_SIZE` (предел ядра
+для одного фиксированного буфера) читаются обычным способом.
+
+Включается переменной окружения USE_IO_URING=1. Без неё — а также если
+`liburing` не установлен — `etl._io` читает файлы обычным способом.
+"""
+from __future__ import annotations
+
+import importlib.util
+import os
+from pathlib import Path
+
+USE_IO_URING = os.getenv("USE_IO_URING", "0") == "1"
+MAX_FIXED_SIZE = 1 << 30  # 1 ГиБ — максимум одного зарегистрированного буфера
+
+
+def enabled() -> bool:
+    """io_uring включён флагом и доступен (Linux + установленный liburing)."""
+    return (USE_IO_URING and os.name == "posix"
+            and importlib.util.find_spec("liburing") is not None)
+
+
+def read_file(path: Path | str) -> bytearray:
+    """Читает файл целиком через io_uring в один буфер и возвращает его."""
+    size = os.stat(path).st_size
+    buf = bytearray(size)
+    if size == 0:
+        return buf
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        n_read = _read_fixed(fd, buf) if size <= MAX_FIXED_SIZE else 0
+        # Короткое чтение (или слишком большой файл) дочитываем в тот же буфер
+        view = memoryview(buf)
+        while n_read < size:
+            n = os.preadv(fd, [view[n_read:]], n_read)
+            if n == 0:
+                raise OSError(f"Unexpected EOF in {path} at byte {n_read} of {size}")
+            n_read += n
+    finally:
+        os.close(fd)
+    return buf
+
+
+def _read_fixed(fd: int, buf: bytearray) -> int:
+    """Одна READ_FIXED в зарегистрированный `buf` с нулевого смещения; возвращает число байт."""
+    import liburing
+
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    liburing.io_uring_queue_init(1, ring)
+    try:
+        iovecs = liburing.Iovec([buf])  # держим ссылку до конца чтения
+        liburing.io_uring_register_buffers(ring, iovecs)
+        try:
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_read_fixed(sqe, fd, buf, 0, 0)
+            liburing.io_uring_submit(ring)
+
+            liburing.io_uring_wait_cqe(ring, cqe)
+            n_read = liburing.trap_error(cqe[0].res)  # OSError при ошибке чтения
+            liburing.io_uring_cq_advance(ring, 1)
+        finally:
+            liburing.io_uring_unregister_buffers(ring)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    return n_read
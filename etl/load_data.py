@@ -10,14 +10,24 @@ Wisconsin Diagnostic dataset.
   2) Берёт сырой CSV-файл `wdbc.data`, скачанный с UCI-репозитория
      (путь передаётся через `--use_local_csv`).
 
+• Результат `load_breast_cancer()` кэшируется `joblib.Memory` в
+  `/dev/shm/bc_cache` (переменная CACHE_DIR): повторные запуски DAG
+  получают read-only memmap вместо повторного разбора CSV внутри sklearn.
+  Ключ кэша — версия scikit-learn и SHA-256 поставляемого CSV, поэтому
+  обновление sklearn или данных не отдаёт устаревшие массивы.
+
 • Выполняет мини-EDA: число строк/столбцов, распределение классов.
 
-• Сохраняет неизменённый датасет в `results/data_raw.csv`
-  (каталог задаётся `--out_dir` или переменной окружения OUT_DIR).
+• Сохраняет неизменённый датасет в `results/data_raw.npz`
+  (каталог задаётся `--out_dir` или переменной окружения OUT_DIR):
+  матрица признаков `X` (float32), метки `y` (int8, M → 1, B → 0)
+  и имена признаков `feature_names`. Колонка `id` UCI-файла
+  неинформативна и не сохраняется. Текстовое представление
+  (CSV) строит только шаг export_results.
 
-Можно запускать:
-  $ python etl/load_data.py                       # sklearn-вариант
-  $ python etl/load_data.py --use_local_csv ./wdbc.data
+Можно запускать (из корня репозитория):
+  $ python -m etl.load_data                      # sklearn-вариант
+  $ python -m etl.load_data --use_local_csv ./wdbc.data
 
 Из Airflow DAG файл импортируется как модуль и вызывается
 функцией `load_data()`.
@@ -25,130 +35,172 @@ Wisconsin Diagnostic dataset.
 from __future__ import annotations
 
 import argparse
-import logging
 import os
 from pathlib import Path
 from typing import Optional
 
-import pandas as pd
+import joblib
+import numpy as np
+import sklearn
+from pyarrow import csv as pacsv
 from sklearn.datasets import load_breast_cancer
 
+from etl._fingerprint import source_fingerprint
+from etl._io import (
+    column_types,
+    features_from_table,
+    labels_from_table,
+    open_input,
+    write_raw_bundle,
+)
+from etl._log import get_logger
+from etl.dataset import Dataset, make_dataset
+
 # --------------------------------------------------------------------------- #
 # Логирование
 # --------------------------------------------------------------------------- #
-logger = logging.getLogger(__name__)
-logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
-_handler = logging.StreamHandler()
-_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
-logger.addHandler(_handler)
+logger = get_logger(__name__)
 
 # --------------------------------------------------------------------------- #
 # Константы
 # --------------------------------------------------------------------------- #
 DEFAULT_OUT_DIR = Path(os.getenv("OUT_DIR", "results"))
-RAW_CSV_NAME = "data_raw.csv"
+RAW_NPZ_NAME = "data_raw.npz"
+
+# Кэш sklearn-набора в RAM (tmpfs); без /dev/shm кэширование отключено
+DEFAULT_CACHE_DIR = Path(os.getenv("CACHE_DIR", "/dev/shm/bc_cache"))
+MEMORY = joblib.Memory(DEFAULT_CACHE_DIR if DEFAULT_CACHE_DIR.parent.is_dir() else None,
+                       mmap_mode="r", compress=0, verbose=0)
+
+# Колонки UCI-файла wdbc.data: id, diagnosis и 30 признаков (mean, se, worst)
+UCI_FEATURES = [
+    "radius_mean",
+    "texture_mean",
+    "perimeter_mean",
+    "area_mean",
+    "smoothness_mean",
+    "compactness_mean",
+    "concavity_mean",
+    "concave_points_mean",
+    "symmetry_mean",
+    "fractal_dimension_mean",
+    "radius_se",
+    "texture_se",
+    "perimeter_se",
+    "area_se",
+    "smoothness_se",
+    "compactness_se",
+    "concavity_se",
+    "concave_points_se",
+    "symmetry_se",
+    "fractal_dimension_se",
+    "radius_worst",
+    "texture_worst",
+    "perimeter_worst",
+    "area_worst",
+    "smoothness_worst",
+    "compactness_worst",
+    "concavity_worst",
+    "concave_points_worst",
+    "symmetry_worst",
+    "fractal_dimension_worst",
+]
+UCI_COLUMNS = ["id", "diagnosis"] + UCI_FEATURES
 
 
 # --------------------------------------------------------------------------- #
 # Функции загрузки
 # --------------------------------------------------------------------------- #
-def _load_from_sklearn() -> pd.DataFrame:
-    """Берёт датасет через scikit-learn, конвертирует в DataFrame."""
-    ds = load_breast_cancer(as_frame=True)
-    df = ds.frame
-    # Приводим целевой столбец к привычным меткам B/M
-    df["diagnosis"] = df["target"].map({0: "B", 1: "M"})
-    df.drop(columns="target", inplace=True)
-    return df
-
-
-def _load_from_csv(csv_path: Path) -> pd.DataFrame:
-    """Читает сырой UCI-файл wdbc.data и назначает названия колонок."""
-    df = pd.read_csv(csv_path, header=None)
-    # Если заголовков нет, вешаем правильные имена (32 колонки)
-    if list(df.columns) == list(range(32)):
-        id_col = ["id"]
-        diag_col = ["diagnosis"]
-        features = [
-            # 30 признаков (mean, se, worst) – полный список из описания набора
-            "radius_mean",
-            "texture_mean",
-            "perimeter_mean",
-            "area_mean",
-            "smoothness_mean",
-            "compactness_mean",
-            "concavity_mean",
-            "concave_points_mean",
-            "symmetry_mean",
-            "fractal_dimension_mean",
-            "radius_se",
-            "texture_se",
-            "perimeter_se",
-            "area_se",
-            "smoothness_se",
-            "compactness_se",
-            "concavity_se",
-            "concave_points_se",
-            "symmetry_se",
-            "fractal_dimension_se",
-            "radius_worst",
-            "texture_worst",
-            "perimeter_worst",
-            "area_worst",
-            "smoothness_worst",
-            "compactness_worst",
-            "concavity_worst",
-            "concave_points_worst",
-            "symmetry_worst",
-            "fractal_dimension_worst",
-        ]
-        df.columns = id_col + diag_col + features
-    return df
+@MEMORY.cache
+def _fetch_sklearn(sklearn_version: str, data_fingerprint: str):
+    """
+    Сырые массивы `load_breast_cancer()` (data, target, feature_names).
+
+    Аргументы не используются в теле — они входят в ключ кэша `MEMORY`:
+    при смене версии sklearn или содержимого CSV набор читается заново.
+    """
+    ds = load_breast_cancer()
+    return ds.data, ds.target, ds.feature_names
+
+
+def _load_from_sklearn() -> Dataset:
+    """
+    Берёт датасет через scikit-learn как готовые ndarray, без DataFrame.
+
+    Разобранные sklearn массивы кэшируются (`_fetch_sklearn`): со второго
+    вызова они читаются как read-only memmap; приведение типов
+    (`make_dataset`) выполняется на каждом вызове, вне кэша.
+    """
+    data, target, feature_names = _fetch_sklearn(sklearn.__version__, source_fingerprint())
+    # В sklearn target_names == ['malignant', 'benign']: 0 — 'M', 1 — 'B';
+    # инвертируем к общей кодировке конвейера (M → 1, как у UCI-источника)
+    return make_dataset(data, 1 - target, feature_names)
+
+
+def _load_from_csv(csv_path: Path) -> Dataset:
+    """Читает сырой UCI-файл wdbc.data (без заголовка) с явной схемой колонок."""
+    table = pacsv.read_csv(
+        open_input(csv_path),
+        read_options=pacsv.ReadOptions(column_names=UCI_COLUMNS),
+        convert_options=pacsv.ConvertOptions(column_types=column_types(UCI_COLUMNS)),
+    )
+    return Dataset(features_from_table(table, UCI_FEATURES), labels_from_table(table),
+                   list(UCI_FEATURES))
 
 
 # --------------------------------------------------------------------------- #
-# Основная функция
+# Основные функции
 # --------------------------------------------------------------------------- #
+def build_raw_dataset(source_csv: Optional[str | Path] = None) -> Dataset:
+    """
+    Загружает датасет в память и логирует базовую статистику (мини-EDA).
+
+    Используется как шагом `load_data`, так и слитным `etl.pipeline.run_pipeline`.
+
+    Возврат
+    -------
+    Dataset — признаки float32, метки int8 (M → 1), имена признаков.
+    """
+    if source_csv:
+        logger.info("Загружаю датасет из локального файла: %s", source_csv)
+        ds = _load_from_csv(Path(source_csv))
+    else:
+        logger.info("Загружаю датасет через sklearn.datasets.load_breast_cancer()")
+        ds = _load_from_sklearn()
+
+    # Мини-EDA
+    n_rows, n_cols = ds.X.shape
+    logger.info("Размер датасета: %d объектов, %d признаков", n_rows, n_cols)
+
+    n_malignant = int(np.count_nonzero(ds.y))
+    logger.info("Распределение классов: B=%d, M=%d", n_rows - n_malignant, n_malignant)
+    return ds
+
+
 def load_data(out_dir: Path | str = DEFAULT_OUT_DIR,
               source_csv: Optional[str | Path] = None) -> str:
     """
-    Загружает датасет, логирует базовую статистику и сохраняет CSV.
+    Загружает датасет, логирует базовую статистику и сохраняет npz.
 
     Параметры
     ---------
     out_dir : Path | str
-        Каталог, куда записывать `data_raw.csv`.
+        Каталог, куда записывать `data_raw.npz`.
     source_csv : str | Path | None
         Путь к локальному wdbc.data. Если None – используется sklearn-версия.
 
     Возврат
     -------
-    str – абсолютный путь к сохранённому CSV.
+    str – абсолютный путь к сохранённому npz-файлу.
     """
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
-    out_csv = out_dir / RAW_CSV_NAME
-
-    if source_csv:
-        logger.info("Загружаю датасет из локального файла: %s", source_csv)
-        df = _load_from_csv(Path(source_csv))
-    else:
-        logger.info("Загружаю датасет через sklearn.datasets.load_breast_cancer()")
-        df = _load_from_sklearn()
-
-    # Мини-EDA
-    n_rows, n_cols = df.shape
-    logger.info("Размер датасета: %d объектов, %d столбцов", n_rows, n_cols)
-
-    if "diagnosis" in df.columns:
-        cls_cnt = df["diagnosis"].value_counts().to_dict()
-        logger.info("Распределение классов: %s",
-                    ", ".join(f"{k}={v}" for k, v in cls_cnt.items()))
+    out_path = out_dir / RAW_NPZ_NAME
 
-    df.to_csv(out_csv, index=False)
-    logger.info("Сырой CSV сохранён: %s", out_csv.resolve())
+    write_raw_bundle(out_path, build_raw_dataset(source_csv))
+    logger.info("Сырой датасет сохранён: %s", out_path.resolve())
 
-    return str(out_csv.resolve())
+    return str(out_path.resolve())
 
 
 # --------------------------------------------------------------------------- #
@@ -157,7 +209,7 @@ def load_data(out_dir: Path | str = DEFAULT_OUT_DIR,
 def _parse_cli_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Загрузка Breast Cancer данных")
     parser.add_argument("--out_dir", default=DEFAULT_OUT_DIR,
-                        help="Папка для сохранения CSV (по умолчанию 'results').")
+                        help="Папка для сохранения data_raw.npz (по умолчанию 'results').")
     parser.add_argument("--use_local_csv", metavar="PATH",
                         help="Путь к wdbc.data; если не указан, берётся вариант из sklearn.")
     return parser.parse_args()
@@ -0,0 +1,133 @@
+"""
+etl/pipeline.py
+===============
+Слитный прогон шагов 1–4 ETL-конвейера в одном процессе.
+
+load_data → preprocess_data → train_model → evaluate_metrics передают
+друг другу `Dataset` (ndarray-ы X float32 / y int8) напрямую, без записи
+и повторного чтения промежуточных файлов: весь набор (< 1 МБ) остаётся
+в памяти.
+
+На диск всегда пишутся только артефакты, нужные шагу export_results
+и инференсу: `model.npz` (scaler свёрнут в коэффициенты), `metrics.json`.
+Промежуточные `data_raw` (npz) / `data_clean` / `test_data` (Parquet)
+сохраняются лишь при `persist_intermediate=True`; иначе оставшиеся от
+прошлых прогонов копии удаляются, чтобы export_results не выгрузил
+наборы, не соответствующие текущей модели.
+
+Запуск
+------
+$ python -m etl.pipeline
+$ python -m etl.pipeline --use_local_csv ./wdbc.data --persist_intermediate
+
+Из Airflow DAG вызывается функция `run_pipeline()`.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+from typing import Optional
+
+from etl._io import write_dataset, write_raw_bundle
+from etl._log import get_logger
+from etl.evaluate_metrics import compute_metrics, save_metrics
+from etl.load_data import RAW_NPZ_NAME, build_raw_dataset
+from etl.preprocess_data import CLEAN_PARQUET_NAME, clean_dataset
+from etl.train_model import TEST_PARQUET_NAME, fit_model, save_model
+
+# --------------------------------------------------------------------------- #
+# Логирование
+# --------------------------------------------------------------------------- #
+logger = get_logger(__name__)
+
+# --------------------------------------------------------------------------- #
+# Константы
+# --------------------------------------------------------------------------- #
+DEFAULT_OUT_DIR = Path(os.getenv("OUT_DIR", "results"))
+INTERMEDIATE_NAMES = (RAW_NPZ_NAME, CLEAN_PARQUET_NAME, TEST_PARQUET_NAME)
+
+
+# --------------------------------------------------------------------------- #
+# Вспомогательные функции
+# --------------------------------------------------------------------------- #
+def _remove_stale_intermediates(out_dir: Path) -> None:
+    """Удаляет промежуточные наборы прошлых прогонов из `out_dir`."""
+    for name in INTERMEDIATE_NAMES:
+        path = out_dir / name
+        if path.exists():
+            path.unlink()
+            logger.info("Удалён устаревший промежуточный набор: %s", path)
+
+
+# --------------------------------------------------------------------------- #
+# Основная функция
+# --------------------------------------------------------------------------- #
+def run_pipeline(out_dir: Path | str = DEFAULT_OUT_DIR,
+                 source_csv: Optional[str | Path] = None,
+                 persist_intermediate: bool = False) -> str:
+    """
+    Выполняет загрузку, предобработку, обучение и оценку за один проход.
+
+    Параметры
+    ---------
+    out_dir : Path | str
+        Каталог для артефактов (`model.npz`, `metrics.json`).
+    source_csv : str | Path | None
+        Путь к локальному wdbc.data. Если None – используется sklearn-версия.
+    persist_intermediate : bool
+        Дополнительно сохранить промежуточные наборы на диск
+        (как при поэтапном запуске). Если False — устаревшие копии
+        этих наборов в `out_dir` удаляются.
+
+    Возврат
+    -------
+    str – абсолютный путь к `metrics.json`.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if not persist_intermediate:
+        _remove_stale_intermediates(out_dir)
+
+    # 1. Загрузка
+    raw = build_raw_dataset(source_csv)
+    if persist_intermediate:
+        write_raw_bundle(out_dir / RAW_NPZ_NAME, raw)
+
+    # 2. Предобработка
+    clean = clean_dataset(raw)
+    if persist_intermediate:
+        write_dataset(clean, out_dir / CLEAN_PARQUET_NAME)
+
+    # 3. Обучение
+    model, test = fit_model(clean)
+    save_model(model, out_dir)
+    if persist_intermediate:
+        write_dataset(test, out_dir / TEST_PARQUET_NAME)
+
+    # 4. Оценка
+    metrics = compute_metrics(model, test.X, test.y)
+    metrics_path = save_metrics(metrics, out_dir)
+
+    logger.info("Конвейер завершён, артефакты в %s", out_dir.resolve())
+    return str(metrics_path.resolve())
+
+
+# --------------------------------------------------------------------------- #
+# CLI-обёртка
+# --------------------------------------------------------------------------- #
+def _parse_cli_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Слитный прогон ETL-конвейера Breast Cancer")
+    parser.add_argument("--out_dir", default=DEFAULT_OUT_DIR,
+                        help="Каталог для артефактов (по умолчанию 'results').")
+    parser.add_argument("--use_local_csv", metavar="PATH",
+                        help="Путь к wdbc.data; если не указан, берётся вариант из sklearn.")
+    parser.add_argument("--persist_intermediate", action="store_true",
+                        help="Сохранять data_raw / data_clean / test_data на диск.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_cli_args()
+    run_pipeline(out_dir=args.out_dir, source_csv=args.use_local_csv,
+                 persist_intermediate=args.persist_intermediate)
@@ -6,21 +6,23 @@ Diagnostic.
 
 Функциональность
 ----------------
-1. Загружает CSV с «сырыми» данными (`results/data_raw.csv` по умолчанию).
-2. Удаляет неинформативную колонку `id`, если она присутствует.
-3. Унифицирует заголовки признаков — заменяет пробелы на `_`, приводит к lower-case.
-4. Проверяет целостность:
-   • наличие колонки `diagnosis`;
-   • отсутствие пропусков в 30 числовых признаках.
-5. Масштабирует признаки `StandardScaler`-ом (z-score).
-6. Сохраняет «чистый» датасет в `results/data_clean.csv`.
-7. Дополнительно сериализует обученный `scaler` в `results/scaler.pkl`
-   (можно использовать на инференсе).
+1. Загружает npz с «сырыми» данными (`results/data_raw.npz` по умолчанию):
+   матрица `X`, метки `y` (M → 1), имена признаков.
+2. Унифицирует заголовки признаков — заменяет пробелы на `_`, приводит к lower-case.
+3. Проверяет целостность:
+   • число меток совпадает с числом объектов;
+   • отсутствие пропусков (NaN) и ±inf в 30 числовых признаках.
+4. Сохраняет «чистый» датасет в `results/data_clean.parquet`.
+
+Признаки **не** масштабируются: z-score выполняется внутри `train_model`
+(Pipeline StandardScaler → LogisticRegression), после чего μ/σ
+сворачиваются в `coef_`/`intercept_` модели. Отдельного артефакта
+scaler-а нет — модель сразу принимает сырые признаки.
 
 Запуск из CLI
 --------------
-$ python etl/preprocess_data.py
-$ python etl/preprocess_data.py --raw_csv other.csv --out_dir another_folder
+$ python -m etl.preprocess_data
+$ python -m etl.preprocess_data --raw_npz other.npz --out_dir another_folder
 
 Использование из Airflow DAG
 ----------------------------
@@ -34,31 +36,27 @@ t2 = PythonOperator(
 from __future__ import annotations
 
 import argparse
-import logging
 import os
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Sequence
 
-import joblib
-import pandas as pd
-from sklearn.preprocessing import StandardScaler
+import numpy as np
+
+from etl._io import read_raw_bundle, write_dataset
+from etl._log import get_logger
+from etl.dataset import Dataset
 
 # --------------------------------------------------------------------------- #
 # Логирование
 # --------------------------------------------------------------------------- #
-logger = logging.getLogger(__name__)
-logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
-_handler = logging.StreamHandler()
-_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
-logger.addHandler(_handler)
+logger = get_logger(__name__)
 
 # --------------------------------------------------------------------------- #
 # Константы и вспомогательные функции
 # --------------------------------------------------------------------------- #
-DEFAULT_RAW_CSV = Path(os.getenv("RAW_CSV", "../results/data_raw.csv"))
+DEFAULT_RAW_NPZ = Path(os.getenv("RAW_NPZ", "../results/data_raw.npz"))
 DEFAULT_OUT_DIR = Path(os.getenv("OUT_DIR", "results"))
-CLEAN_CSV_NAME = "data_clean.csv"
-SCALER_FILENAME = "scaler.pkl"
+CLEAN_PARQUET_NAME = "data_clean.parquet"
 
 
 def _standardize_headers(columns: Sequence[str]) -> list[str]:
@@ -69,69 +67,73 @@ def _standardize_headers(columns: Sequence[str]) -> list[str]:
 
 
 # --------------------------------------------------------------------------- #
-# Основная функция
+# Основные функции
 # --------------------------------------------------------------------------- #
-def preprocess_data(raw_csv: Path | str = DEFAULT_RAW_CSV,
-                    out_dir: Path | str = DEFAULT_OUT_DIR) -> str:
+def clean_dataset(raw: Dataset) -> Dataset:
     """
-    Выполняет очистку и масштабирование признаков.
+    Проверяет набор в памяти и унифицирует имена признаков.
 
     Параметры
     ---------
-    raw_csv : str | Path
-        Путь к CSV с сырым набором (результат шага «load_data»).
-    out_dir : str | Path
-        Папка для сохранения «чистого» набора и scaler-а.
+    raw : Dataset
+        Сырой набор (результат `etl.load_data.build_raw_dataset`).
 
     Возврат
     -------
-    str — абсолютный путь к `data_clean.csv`.
+    Dataset — «чистый» набор (признаки в исходном масштабе).
     """
-    raw_csv = Path(raw_csv)
-    out_dir = Path(out_dir)
-    out_dir.mkdir(parents=True, exist_ok=True)
+    # 1. Унификация заголовков
+    feature_cols = _standardize_headers(raw.feature_names)
 
-    if not raw_csv.exists():
-        raise FileNotFoundError(f"Raw data file not found: {raw_csv}")
+    # 2. Проверки целостности
+    if len(raw.y) != len(raw.X):
+        raise ValueError(f"Число меток ({len(raw.y)}) не совпадает с числом объектов ({len(raw.X)}).")
 
-    logger.info("Читаю сырые данные: %s", raw_csv)
-    df = pd.read_csv(raw_csv)
+    if len(feature_cols) != 30:
+        logger.warning("Ожидается 30 числовых признаков, получено: %d", len(feature_cols))
 
-    # 1. Удаляем неинформативный ID, если есть
-    if "id" in df.columns:
-        df = df.drop(columns="id")
-        logger.debug("Колонка 'id' удалена.")
+    # Один проход np.isfinite ловит и NaN, и ±inf; подсчёт — только при ошибке
+    if not np.isfinite(raw.X).all():
+        n_bad = int((~np.isfinite(raw.X)).sum())
+        raise ValueError(f"Обнаружено {n_bad} пропущенных/бесконечных значений в признаках.")
 
-    # 2. Унификация заголовков
-    df.columns = _standardize_headers(df.columns)
+    logger.info("Проверка целостности пройдена: %d объектов, %d признаков.",
+                len(raw.X), len(feature_cols))
+    return Dataset(raw.X, raw.y, feature_cols)
 
-    # 3. Проверки целостности
-    if "diagnosis" not in df.columns:
-        raise ValueError("Ожидаемая колонка 'diagnosis' отсутствует.")
 
-    feature_cols = [c for c in df.columns if c != "diagnosis"]
-    if len(feature_cols) != 30:
-        logger.warning("Ожидается 30 числовых признаков, получено: %d", len(feature_cols))
+def preprocess_data(raw_npz: Path | str = DEFAULT_RAW_NPZ,
+                    out_dir: Path | str = DEFAULT_OUT_DIR) -> str:
+    """
+    Выполняет очистку и проверку набора.
+
+    Параметры
+    ---------
+    raw_npz : str | Path
+        Путь к npz с сырым набором (результат шага «load_data»).
+    out_dir : str | Path
+        Папка для сохранения «чистого» набора.
 
-    if df[feature_cols].isnull().any().any():
-        n_missing = df[feature_cols].isnull().sum().sum()
-        raise ValueError(f"Обнаружено {n_missing} пропущенных значений в признаках.")
+    Возврат
+    -------
+    str — абсолютный путь к `data_clean.parquet`.
+    """
+    raw_npz = Path(raw_npz)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
 
-    # 4. Масштабирование признаков (z-score)
-    scaler = StandardScaler()
-    df[feature_cols] = scaler.fit_transform(df[feature_cols])
-    logger.info("Стандартизация завершена (μ≈0, σ≈1).")
+    if not raw_npz.exists():
+        raise FileNotFoundError(f"Raw data file not found: {raw_npz}")
 
-    # 5. Сохранение
-    clean_csv = out_dir / CLEAN_CSV_NAME
-    df.to_csv(clean_csv, index=False)
-    logger.info("Очищенный датасет сохранён: %s", clean_csv.resolve())
+    logger.info("Читаю сырые данные: %s", raw_npz)
+    ds = clean_dataset(read_raw_bundle(raw_npz))
 
-    scaler_path = out_dir / SCALER_FILENAME
-    joblib.dump(scaler, scaler_path)
-    logger.info("Scaler сериализован: %s", scaler_path.resolve())
+    # 4. Сохранение
+    clean_path = out_dir / CLEAN_PARQUET_NAME
+    write_dataset(ds, clean_path)
+    logger.info("Очищенный датасет сохранён: %s", clean_path.resolve())
 
-    return str(clean_csv.resolve())
+    return str(clean_path.resolve())
 
 
 # --------------------------------------------------------------------------- #
@@ -139,8 +141,8 @@ def preprocess_data(raw_csv: Path | str = DEFAULT_RAW_CSV,
 # --------------------------------------------------------------------------- #
 def _parse_cli_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Очистка и предобработка данных Breast Cancer")
-    parser.add_argument("--raw_csv", default=DEFAULT_RAW_CSV,
-                        help="Путь к data_raw.csv (по умолчанию results/data_raw.csv)")
+    parser.add_argument("--raw_npz", default=DEFAULT_RAW_NPZ,
+                        help="Путь к data_raw.npz (по умолчанию results/data_raw.npz)")
     parser.add_argument("--out_dir", default=DEFAULT_OUT_DIR,
                         help="Каталог для сохранения результатов (по умолчанию 'results').")
     return parser.parse_args()
@@ -148,4 +150,4 @@ def _parse_cli_args() -> argparse.Namespace:
 
 if __name__ == "__main__":
     args = _parse_cli_args()
-    preprocess_data(raw_csv=args.raw_csv, out_dir=args.out_dir)
+    preprocess_data(raw_npz=args.raw_npz, out_dir=args.out_dir)
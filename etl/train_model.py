@@ -5,52 +5,59 @@ etl/train_model.py
 
 Алгоритм
 --------
-1. Читаем «чистый» датасет (results/data_clean.csv).
-2. Делим на train / test (80 % / 20 %, random_state=42, стратификация по `diagnosis`).
-3. Кодируем метки: Benign → 0, Malignant → 1.
-4. Обучаем LogisticRegression (solver='liblinear', max_iter=1000).
-5. Считаем Accuracy на тесте – логируем для контроля.
-6. Сохраняем:
-   • модель `results/model.pkl` (joblib.dump, compressed=True);
-   • тестовый CSV `results/test_data.csv`
+1. Читаем «чистый» датасет (results/data_clean.parquet).
+2. Делим на train / test (80 % / 20 %, random_state=42, стратификация по `diagnosis`)
+   прямо на ndarray-ях, без DataFrame.
+3. Метки уже закодированы: Benign → 0, Malignant → 1 (int8).
+4. Обучаем Pipeline StandardScaler → LogisticRegression
+   (solver='liblinear', max_iter=1000) на сырых признаках.
+5. Сворачиваем масштабирование в параметры модели:
+   coef' = coef / σ,  intercept' = intercept − coef · (μ / σ).
+   Сохраняется «голая» LogisticRegression, которая принимает сырые
+   признаки: на инференсе одно умножение вместо transform + predict.
+6. Считаем Accuracy на тесте (свёрнутой моделью) – логируем для контроля.
+7. Сохраняем:
+   • модель `results/model.npz` — только `coef` / `intercept` / `classes`
+     (без pickle; загружается `etl._io.read_model`);
+   • тестовый набор `results/test_data.parquet`
      (30 признаков + diagnosis — **без** предсказаний, чтобы последующий
       шаг evaluate_metrics сам их получал).
 
 Запуск
 ------
-$ python etl/train_model.py
-$ python etl/train_model.py --clean_csv results/data_clean.csv --out_dir results
+$ python -m etl.train_model
+$ python -m etl.train_model --clean_parquet results/data_clean.parquet --out_dir results
 """
 from __future__ import annotations
 
 import argparse
-import logging
 import os
 from pathlib import Path
 from typing import Tuple
 
-import joblib
-import pandas as pd
+import numpy as np
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score
 from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from etl._io import read_dataset, write_dataset, write_model
+from etl._log import get_logger
+from etl.dataset import Dataset
 
 # --------------------------------------------------------------------------- #
 # Логирование
 # --------------------------------------------------------------------------- #
-logger = logging.getLogger(__name__)
-logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
-_handler = logging.StreamHandler()
-_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
-logger.addHandler(_handler)
+logger = get_logger(__name__)
 
 # --------------------------------------------------------------------------- #
 # Константы
 # --------------------------------------------------------------------------- #
-DEFAULT_CLEAN_CSV = Path(os.getenv("CLEAN_CSV", "../results/data_clean.csv"))
+DEFAULT_CLEAN_PARQUET = Path(os.getenv("CLEAN_PARQUET", "../results/data_clean.parquet"))
 DEFAULT_OUT_DIR = Path(os.getenv("OUT_DIR", "results"))
-MODEL_FILENAME = "model.pkl"
-TEST_CSV_NAME = "test_data.csv"
+MODEL_FILENAME = "model.npz"
+TEST_PARQUET_NAME = "test_data.parquet"
 
 RANDOM_STATE = 42
 TEST_SIZE = 0.2  # 20 %
@@ -59,78 +66,105 @@ TEST_SIZE = 0.2  # 20 %
 # --------------------------------------------------------------------------- #
 # Вспомогательные функции
 # --------------------------------------------------------------------------- #
-def _load_dataset(clean_csv: Path | str) -> Tuple[pd.DataFrame, pd.Series]:
-    """Загружает датасет и возвращает X, y (diagnosis)."""
-    df = pd.read_csv(clean_csv)
-    if "diagnosis" not in df.columns:
-        raise ValueError("В clean CSV отсутствует колонка 'diagnosis'.")
+def _fold_scaler(pipe: Pipeline) -> LogisticRegression:
+    """
+    Переносит z-score шага `s` в коэффициенты шага `m`.
 
-    X = df.drop(columns="diagnosis")
-    y = df["diagnosis"].map({"B": 0, "M": 1})  # бинаризация
-    return X, y
+    Возвращает новую LogisticRegression с теми же гиперпараметрами,
+    которая на сырых X даёт те же decision_function, что и весь Pipeline.
+    """
+    scaler, fitted = pipe["s"], pipe["m"]
+    mu, sigma = scaler.mean_, scaler.scale_
+
+    model = LogisticRegression(**fitted.get_params())
+    model.coef_ = fitted.coef_ / sigma
+    model.intercept_ = fitted.intercept_ - (fitted.coef_ * (mu / sigma)).sum(axis=1)
+    model.classes_ = fitted.classes_
+    model.n_features_in_ = fitted.n_features_in_
+    model.n_iter_ = fitted.n_iter_
+    return model
 
 
 # --------------------------------------------------------------------------- #
-# Основная функция
+# Основные функции
 # --------------------------------------------------------------------------- #
-def train_model(clean_csv: Path | str = DEFAULT_CLEAN_CSV,
+def fit_model(ds: Dataset) -> Tuple[LogisticRegression, Dataset]:
+    """
+    Делит данные на train / test и обучает LogisticRegression в памяти.
+
+    Возврат
+    -------
+    (model, test) — обученная модель и отложенная выборка (Dataset).
+    """
+    # 2. Train / Test split (ndarray-ы напрямую, без DataFrame)
+    X_train, X_test, y_train, y_test = train_test_split(
+        ds.X, ds.y, test_size=TEST_SIZE, stratify=ds.y, random_state=RANDOM_STATE
+    )
+    logger.info("Train/test split: train=%d, test=%d", len(X_train), len(X_test))
+
+    # 3. Обучаем StandardScaler → LogisticRegression
+    pipe = Pipeline([
+        ("s", StandardScaler()),
+        ("m", LogisticRegression(solver="liblinear", max_iter=1000,
+                                 random_state=RANDOM_STATE)),
+    ])
+    pipe.fit(X_train, y_train)
+
+    # 4. Сворачиваем μ/σ в coef_/intercept_
+    model = _fold_scaler(pipe)
+    logger.info("Модель обучена (scaler свёрнут в коэффициенты): %s", model)
+
+    # 5. Базовая оценка Accuracy
+    y_pred = model.predict(X_test)
+    acc = accuracy_score(y_test, y_pred)
+    logger.info("Accuracy на тесте: %.4f", acc)
+    return model, Dataset(np.ascontiguousarray(X_test), y_test, ds.feature_names)
+
+
+def save_model(model: LogisticRegression, out_dir: Path | str) -> Path:
+    """Сохраняет коэффициенты модели в `out_dir/model.npz`."""
+    model_path = Path(out_dir) / MODEL_FILENAME
+    write_model(model, model_path)
+    logger.info("Model saved: %s", model_path.resolve())
+    return model_path
+
+
+def train_model(clean_parquet: Path | str = DEFAULT_CLEAN_PARQUET,
                 out_dir: Path | str = DEFAULT_OUT_DIR) -> str:
     """
     Обучает LogisticRegression, сохраняет модель и тестовый набор.
 
     Параметры
     ---------
-    clean_csv : str | Path
-        Путь к подготовленному датасету (`data_clean.csv`).
+    clean_parquet : str | Path
+        Путь к подготовленному датасету (`data_clean.parquet`).
     out_dir : str | Path
-        Папка для сохранения `model.pkl` и `test_data.csv`.
+        Папка для сохранения `model.npz` и `test_data.parquet`.
 
     Возврат
     -------
     str – абсолютный путь к сохранённой модели.
     """
-    clean_csv = Path(clean_csv)
+    clean_parquet = Path(clean_parquet)
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    if not clean_csv.exists():
-        raise FileNotFoundError(f"Clean CSV not found: {clean_csv}")
+    if not clean_parquet.exists():
+        raise FileNotFoundError(f"Clean dataset not found: {clean_parquet}")
 
     # 1. Загружаем данные
-    X, y = _load_dataset(clean_csv)
-
-    # 2. Train / Test split
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=TEST_SIZE, stratify=y, random_state=RANDOM_STATE
-    )
-    logger.info("Train/test split: train=%d, test=%d", len(X_train), len(X_test))
-
-    # 3. Обучаем модель
-    model = LogisticRegression(
-        solver="liblinear",
-        max_iter=1000,
-        random_state=RANDOM_STATE,
-    )
-    model.fit(X_train, y_train)
-    logger.info("Модель обучена: %s", model)
+    ds = read_dataset(clean_parquet)
 
-    # 4. Базовая оценка Accuracy
-    y_pred = model.predict(X_test)
-    acc = accuracy_score(y_test, y_pred)
-    logger.info("Accuracy на тесте: %.4f", acc)
+    # 2–6. Split, обучение, свёртка scaler-а, контрольная Accuracy
+    model, test = fit_model(ds)
 
-    # 5. Сохраняем модель
-    model_path = out_dir / MODEL_FILENAME
-    joblib.dump(model, model_path, compress=True)
-    logger.info("Model saved: %s", model_path.resolve())
+    # 7. Сохраняем модель
+    model_path = save_model(model, out_dir)
 
-    # 6. Сохраняем тестовый CSV (признаки + diagnosis в строках)
-    #    Восстанавливаем строки diagnosis B/M для удобства следующих шагов
-    diagnosis_series = y_test.map({0: "B", 1: "M"}).rename("diagnosis")
-    test_df = pd.concat([X_test.reset_index(drop=True), diagnosis_series.reset_index(drop=True)], axis=1)
-    test_csv_path = out_dir / TEST_CSV_NAME
-    test_df.to_csv(test_csv_path, index=False)
-    logger.info("Test data saved: %s", test_csv_path.resolve())
+    # 7. Сохраняем тестовый набор (признаки + diagnosis B/M)
+    test_path = out_dir / TEST_PARQUET_NAME
+    write_dataset(test, test_path)
+    logger.info("Test data saved: %s", test_path.resolve())
 
     return str(model_path.resolve())
 
@@ -140,8 +174,8 @@ def train_model(clean_csv: Path | str = DEFAULT_CLEAN_CSV,
 # --------------------------------------------------------------------------- #
 def _parse_cli_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Обучение LogisticRegression на Breast Cancer")
-    parser.add_argument("--clean_csv", default=DEFAULT_CLEAN_CSV,
-                        help="Path to data_clean.csv (default: results/data_clean.csv)")
+    parser.add_argument("--clean_parquet", default=DEFAULT_CLEAN_PARQUET,
+                        help="Path to data_clean.parquet (default: results/data_clean.parquet)")
     parser.add_argument("--out_dir", default=DEFAULT_OUT_DIR,
                         help="Directory to save model & test data (default: results)")
     return parser.parse_args()
@@ -149,4 +183,4 @@ def _parse_cli_args() -> argparse.Namespace:
 
 if __name__ == "__main__":
     args = _parse_cli_args()
-    train_model(clean_csv=args.clean_csv, out_dir=args.out_dir)
+    train_model(clean_parquet=args.clean_parquet, out_dir=args.out_dir)